@@ -1,143 +1,488 @@
 # LINKED LIST IMPLEMENTATION
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime
+
+def date_key(iso_date):
+    """Encode an ISO date ('YYYY-MM-DD...') as the integer YYYYMMDD"""
+    return int(iso_date[0:4]) * 10000 + int(iso_date[5:7]) * 100 + int(iso_date[8:10])
+
+def day_key(day):
+    """Strictly parse a 'YYYY-MM-DD' day into its key; raises ValueError otherwise"""
+    if not isinstance(day, str) or len(day) != 10:
+        raise ValueError(f"not a YYYY-MM-DD date: {day!r}")
+    datetime.strptime(day, '%Y-%m-%d')
+    return date_key(day)
+
 class Node:
-    """Node for linked list storing journal notes"""
+    """Node for doubly linked list storing journal notes"""
+    __slots__ = ('data', 'day_key', 'seq', 'next', 'prev')
+    
     def __init__(self, note_data):
+        note_data.setdefault('deleted', False)
         self.data = note_data
+        try:
+            self.day_key = date_key(note_data['date'])
+        except (KeyError, TypeError, ValueError):
+            # Not ISO-dated: keep the note, but no date query will match key 0
+            self.day_key = 0
+        self.seq = 0
         self.next = None
+        self.prev = None
 
 class NotesLinkedList:
     """Linked list to store journal notes"""
     def __init__(self):
         self.head = None
         self.size = 0
+        self.by_id = {}
+        self.by_date = defaultdict(dict)
+        self.days = []
+        self.trash = {}
+        self.photo_nodes = {}
+        self.next_seq = 0
+        self.generation = 0
+        self.notes_cache = None
+        self.notes_cache_gen = -1
+        self.photo_cache = None
+        self.photo_cache_gen = -1
     
     def add_note(self, note_data):
-        """Add a new note to the beginning (most recent first)"""
+        """Add a new note to the beginning (None if the ID is already taken)"""
+        if note_data['id'] in self.by_id:
+            return None
+        
         new_node = Node(note_data)
-        new_node.next = self.head
-        self.head = new_node
-        self.size += 1
+        self.link_node(new_node)
+        if not note_data['deleted']:
+            self.index_live(new_node)
+        self.generation += 1
         return new_node
     
+    def load_notes(self, notes_data):
+        """Bulk-load notes saved most recent first; returns how many records were skipped"""
+        # Build and check every node first so linking below cannot fail halfway
+        nodes = []
+        skipped = 0
+        taken = set(self.by_id)
+        for note_data in reversed(notes_data):
+            try:
+                node = Node(note_data)
+                note_id = note_data['id']
+                # Older journals can hold clashing millisecond IDs; keep both notes
+                while note_id in taken:
+                    note_id += 1
+            except (AttributeError, KeyError, TypeError):
+                skipped += 1
+                continue
+            note_data['id'] = note_id
+            taken.add(note_id)
+            nodes.append(node)
+        
+        for node in nodes:
+            self.link_node(node)
+            if not node.data['deleted']:
+                self.index_live(node, keep_sorted=False)
+        
+        # Sort the day column once instead of insorting per new day
+        self.days = sorted(self.by_date)
+        self.generation += 1
+        return skipped
+    
+    def link_node(self, node):
+        """Link a node at the head and register it by ID (and in the trash if deleted)"""
+        # Chain position: newer nodes sit nearer the head and get a higher seq
+        node.seq = self.next_seq
+        self.next_seq += 1
+        node.next = self.head
+        if self.head:
+            self.head.prev = node
+        self.head = node
+        self.by_id[node.data['id']] = node
+        if node.data['deleted']:
+            self.trash[node.data['id']] = node
+        self.size += 1
+    
+    def unique_id(self, note_id):
+        """Bump a note ID past any ID already in use"""
+        while note_id in self.by_id:
+            note_id += 1
+        return note_id
+    
+    def index_live(self, node, keep_sorted=True):
+        """Add a live note to the date and photo indexes"""
+        bucket = self.by_date[node.day_key]
+        if not bucket and keep_sorted:
+            insort(self.days, node.day_key)
+        self.insert_in_chain_order(bucket, node)
+        if node.data.get('photos'):
+            self.insert_in_chain_order(self.photo_nodes, node)
+    
+    def insert_in_chain_order(self, index, node):
+        """Insert into an index dict, keeping it oldest first like the chain read backwards"""
+        last = next(reversed(index.values()), None)
+        index[node.data['id']] = node
+        if last is not None and last.seq > node.seq:
+            # A restored note is older than the newest entry; re-sort by chain position
+            ordered = sorted(index.values(), key=lambda n: n.seq)
+            index.clear()
+            index.update((n.data['id'], n) for n in ordered)
+    
+    def unindex_live(self, node):
+        """Remove a note from the date and photo indexes"""
+        self.photo_nodes.pop(node.data['id'], None)
+        bucket = self.by_date.get(node.day_key)
+        if bucket is not None:
+            bucket.pop(node.data['id'], None)
+            if not bucket:
+                del self.by_date[node.day_key]
+                self.days.pop(bisect_left(self.days, node.day_key))
+    
+    def unlink(self, node):
+        """Detach a node from the chain"""
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+    
     def delete_note(self, note_id):
         """Delete a note by ID"""
-        if self.head is None:
+        node = self.by_id.pop(note_id, None)
+        if node is None:
             return False
         
-        if self.head.data['id'] == note_id:
-            self.head = self.head.next
-            self.size -= 1
-            return True
-        
-        current = self.head
-        while current.next:
-            if current.next.data['id'] == note_id:
-                current.next = current.next.next
-                self.size -= 1
-                return True
-            current = current.next
-        
-        return False
+        self.unlink(node)
+        if self.trash.pop(note_id, None) is None:
+            self.unindex_live(node)
+        self.size -= 1
+        self.generation += 1
+        return True
     
     def get_notes_by_date(self, target_date):
         """Get all notes for a specific date (YYYY-MM-DD)"""
-        notes = []
-        current = self.head
-        
-        while current:
-            note_date = current.data['date'].split('T')[0]
-            if note_date == target_date:
-                notes.append(current.data)
-            current = current.next
-        
-        return notes
+        try:
+            return self.get_notes_by_key(day_key(target_date))
+        except ValueError:
+            return []
+    
+    def get_notes_by_key(self, key):
+        """Get all notes for a YYYYMMDD date key"""
+        bucket = self.by_date.get(key)
+        if not bucket:
+            return []
+        return [node.data for node in reversed(bucket.values())]
+    
+    def get_keys_between(self, start_key, end_key):
+        """Get the date keys that have notes in an inclusive range"""
+        return self.days[bisect_left(self.days, start_key):bisect_right(self.days, end_key)]
     
     def get_all_notes(self):
-        """Get all notes in the list"""
+        """Get all notes in the list (cached until the list changes)"""
+        if self.notes_cache_gen == self.generation:
+            return self.notes_cache
+        
+        generation = self.generation
         notes = []
         current = self.head
         while current:
             notes.append(current.data)
             current = current.next
+        
+        self.notes_cache = notes
+        self.notes_cache_gen = generation
         return notes
     
-    def get_notes_with_photos(self):
-        """Get all photos from notes"""
+    def get_photo_columns(self):
+        """Get parallel (date keys, photos) lists (cached until the list changes)"""
+        if self.photo_cache_gen == self.generation:
+            return self.photo_cache
+        
+        generation = self.generation
+        keys = []
         photos = []
-        current = self.head
         
-        while current:
-            if current.data.get('photos'):
-                for photo_data in current.data['photos']:
-                    photos.append({
-                        'src': photo_data,
-                        'mood': current.data['mood'],
-                        'date': current.data['date'],
-                        'text': current.data['text'],
-                        'note_id': current.data['id'],
-                        'deleted': current.data.get('deleted', False)
-                    })
-            current = current.next
+        for node in reversed(self.photo_nodes.values()):
+            for photo_data in node.data['photos']:
+                keys.append(node.day_key)
+                photos.append({
+                    'src': photo_data,
+                    'mood': node.data['mood'],
+                    'date': node.data['date'],
+                    'text': node.data['text'],
+                    'note_id': node.data['id'],
+                    'deleted': False
+                })
         
-        return photos
+        self.photo_cache = (keys, photos)
+        self.photo_cache_gen = generation
+        return self.photo_cache
 
     def get_deleted_notes(self):
         """Get all deleted notes"""
-        deleted = []
-        current = self.head
-        while current:
-            if current.data.get('deleted'):
-                deleted.append(current.data)
-            current = current.next
-        return deleted
+        return [node.data for node in self.trash.values()]
+    
+    def trash_note(self, note_id):
+        """Soft delete a note (move to trash)"""
+        node = self.by_id.get(note_id)
+        if node is None:
+            return False
+        
+        if note_id not in self.trash:
+            node.data['deleted'] = True
+            self.unindex_live(node)
+            self.trash[note_id] = node
+            self.generation += 1
+        return True
     
     def restore_note(self, note_id):
         """Restore a deleted note"""
-        current = self.head
-        while current:
-            if current.data['id'] == note_id and current.data.get('deleted'):
-                current.data['deleted'] = False
-                return True
-            current = current.next
-        return False
+        node = self.trash.pop(note_id, None)
+        if node is None:
+            return False
+        
+        node.data['deleted'] = False
+        self.index_live(node)
+        self.generation += 1
+        return True
 
 # JOURNAL APP BACKEND
-import json
+import gzip
+import itertools
+import mmap
 import os
+import shutil
+import threading
+import time
+import zlib
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, send_from_directory
+import orjson
+from flask import Flask, Response, request, send_from_directory
 from flask_cors import CORS
 
 class JournalAppBackend:
     def __init__(self):
         self.app = Flask(__name__, static_folder='static')
-        CORS(self.app)
+        CORS(self.app, resources={r"/api/*": {"origins": "*"}})
         self.notes_list = NotesLinkedList()
         self.data_file = 'journal_data.json'
+        self.log_file = 'journal_data.ndjson'
+        self.appended_ops = 0
+        self.compress_min_size = 1024
+        self.lock = threading.RLock()
+        self.dirty = threading.Event()
+        self.compact_delay = 0.25
+        self.can_compact = True
         
         self.load_data()
+        self.log = open(self.log_file, 'ab', buffering=0)
+        if self.appended_ops > 2 * self.notes_list.size:
+            self.compact()
+        threading.Thread(target=self.writer_loop, daemon=True).start()
         self.setup_routes()
     
     def load_data(self):
         """Load notes from JSON file"""
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    notes_data = json.load(f)
-                    for note in reversed(notes_data):
-                        self.notes_list.add_note(note)
-                print(f"✓ Loaded {self.notes_list.size} notes")
+                skipped = 0
+                with open(self.data_file, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                skipped = self.notes_list.load_notes(orjson.loads(view))
+                if skipped:
+                    print(f"✗ Skipped {skipped} unreadable notes")
+                    self.preserve_snapshot()
             except Exception as e:
                 print(f"✗ Error loading data: {e}")
+                self.preserve_snapshot()
+        self.replay_log()
+        print(f"✓ Loaded {self.notes_list.size} notes")
+    
+    def preserve_snapshot(self):
+        """Copy aside a snapshot that did not load cleanly before compaction replaces it"""
+        backup_file = f"{self.data_file}.bad-{datetime.now():%Y%m%d%H%M%S}"
+        try:
+            shutil.copy2(self.data_file, backup_file)
+            print(f"✗ Kept the original snapshot as {backup_file}")
+        except Exception as e:
+            # Never overwrite data we could not back up
+            print(f"✗ Error backing up snapshot, compaction disabled: {e}")
+            self.can_compact = False
+    
+    def replay_log(self):
+        """Apply mutations logged since the last snapshot"""
+        if not os.path.exists(self.log_file):
+            return
+        try:
+            with open(self.log_file, 'rb+') as f:
+                valid_end = 0
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Torn append from a crash; cut it so new records start on a fresh line
+                        print(f"✗ Dropping torn log record at byte {valid_end}")
+                        f.truncate(valid_end)
+                        break
+                    valid_end += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        self.apply_op(orjson.loads(line))
+                        self.appended_ops += 1
+                    except Exception as e:
+                        print(f"✗ Skipping bad log record: {e}")
+        except Exception as e:
+            print(f"✗ Error replaying log: {e}")
+    
+    def apply_op(self, record):
+        """Apply one logged mutation to the notes list"""
+        op = record['op']
+        if op == 'add':
+            # A crash between snapshot and log truncation replays adds already in the snapshot
+            return self.notes_list.add_note(record['note']) is not None
+        elif op == 'trash':
+            return self.notes_list.trash_note(record['id'])
+        elif op == 'restore':
+            return self.notes_list.restore_note(record['id'])
+        elif op == 'del':
+            return self.notes_list.delete_note(record['id'])
+        return False
+    
+    def mutate(self, record):
+        """Apply a mutation and log it, serialized across request threads"""
+        # Encode first: a record the log cannot hold must not reach the list
+        line = orjson.dumps(record) + b'\n'
+        with self.lock:
+            if not self.apply_op(record):
+                return False
+            self.write_op(line)
+            return True
+    
+    def write_op(self, line):
+        """Append one encoded mutation to the log instead of rewriting the snapshot"""
+        try:
+            self.log.write(line)
+            self.appended_ops += 1
+        except Exception as e:
+            print(f"✗ Error saving: {e}")
+        if self.appended_ops > 2 * self.notes_list.size:
+            self.dirty.set()
+    
+    def writer_loop(self):
+        """Compact in the background, coalescing bursts of mutations"""
+        while True:
+            self.dirty.wait()
+            time.sleep(self.compact_delay)
+            self.dirty.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                # Keep the thread alive; the log still holds every op
+                print(f"✗ Error compacting: {e}")
+    
+    def compact(self):
+        """Fold the log into a fresh snapshot and truncate it"""
+        if not self.can_compact:
+            return
+        
+        with self.lock:
+            body = orjson.dumps(self.notes_list.get_all_notes(), option=orjson.OPT_INDENT_2)
+            offset = self.log.tell()
+            folded_ops = self.appended_ops
+        
+        # Write outside the lock; ops logged meanwhile are kept below
+        if not self.save_data(body):
+            return
+        
+        with self.lock:
+            tail = b''
+            if self.log.tell() > offset:
+                with open(self.log_file, 'rb') as f:
+                    f.seek(offset)
+                    tail = f.read()
+            
+            # Swap in the shortened log atomically, like save_data does for the snapshot
+            tmp_file = self.log_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            self.log.close()
+            try:
+                os.replace(tmp_file, self.log_file)
+                self.appended_ops -= folded_ops
+            finally:
+                self.log = open(self.log_file, 'ab', buffering=0)
     
-    def save_data(self):
-        """Save notes to JSON file"""
+    def save_data(self, body):
+        """Atomically replace the JSON snapshot"""
+        tmp_file = self.data_file + '.tmp'
         try:
-            all_notes = self.notes_list.get_all_notes()
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(all_notes, f, indent=2, ensure_ascii=False)
+            with open(tmp_file, 'wb') as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            return True
         except Exception as e:
             print(f"✗ Error saving: {e}")
+            return False
+    
+    def accepts_gzip(self):
+        """Check whether the client accepts gzip (a q=0 entry is a refusal)"""
+        return request.accept_encodings['gzip'] > 0
+    
+    def json_response(self, data, status=200):
+        """Build a JSON response encoded with orjson (gzipped when large)"""
+        body = orjson.dumps(data)
+        response = Response(body, status=status, mimetype='application/json')
+        response.vary.add('Accept-Encoding')
+        if len(body) >= self.compress_min_size and self.accepts_gzip():
+            response.set_data(gzip.compress(body))
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+    
+    def stream_json(self, items, chunk_size=65536):
+        """Stream a JSON array in chunks instead of buffering the whole body"""
+        encoded = map(orjson.dumps, items)
+        head = []
+        size = 2
+        for item in encoded:
+            head.append(item)
+            size += len(item) + 1
+            if size >= self.compress_min_size:
+                break
+        else:
+            # Below the compression threshold: send it whole, same as other small bodies
+            return self.json_response(items)
+        
+        def generate():
+            buffer = bytearray(b'[')
+            for i, item in enumerate(itertools.chain(head, encoded)):
+                if i:
+                    buffer += b','
+                buffer += item
+                if len(buffer) >= chunk_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+            buffer += b']'
+            yield bytes(buffer)
+        
+        def generate_gzip():
+            compressor = zlib.compressobj(wbits=31)
+            for chunk in generate():
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+            yield compressor.flush()
+        
+        headers = {'Vary': 'Accept-Encoding'}
+        if self.accepts_gzip():
+            headers['Content-Encoding'] = 'gzip'
+            return Response(generate_gzip(), mimetype='application/json', headers=headers)
+        return Response(generate(), mimetype='application/json', headers=headers)
     
     def setup_routes(self):
         """Setup Flask routes"""
@@ -155,12 +500,14 @@ class JournalAppBackend:
             """Get notes with optional date filter"""
             date_filter = request.args.get('date')
             
-            if date_filter:
-                notes = self.notes_list.get_notes_by_date(date_filter)
-            else:
-                notes = self.notes_list.get_all_notes()
+            # Snapshot under the lock so request threads never see a half-applied mutation
+            with self.lock:
+                if date_filter:
+                    notes = self.notes_list.get_notes_by_date(date_filter)
+                else:
+                    notes = self.notes_list.get_all_notes()
             
-            return jsonify(notes)
+            return self.stream_json(notes)
         
         @self.app.route('/api/notes', methods=['POST'])
         def add_note():
@@ -169,11 +516,16 @@ class JournalAppBackend:
                 note_data = request.get_json()
                 
                 if not note_data.get('text') or not note_data.get('mood'):
-                    return jsonify({'error': 'Text and mood required'}), 400
+                    return self.json_response({'error': 'Text and mood required'}, 400)
                 
                 if not note_data.get('date'):
                     note_data['date'] = datetime.now().isoformat()
                 
+                try:
+                    day_key(note_data['date'][:10])
+                except (TypeError, ValueError):
+                    return self.json_response({'error': 'Date must be ISO 8601 (YYYY-MM-DD...)'}, 400)
+                
                 if not note_data.get('id'):
                     note_data['id'] = int(datetime.now().timestamp() * 1000)
                 
@@ -183,31 +535,27 @@ class JournalAppBackend:
                 if 'title' not in note_data:
                     note_data['title'] = ''
                 
-                if 'deleted' not in note_data:
-                    note_data['deleted'] = False
-                
-                self.notes_list.add_note(note_data)
-                self.save_data()
+                # Millisecond IDs collide on fast posts; claim a free one atomically
+                with self.lock:
+                    note_data['id'] = self.notes_list.unique_id(note_data['id'])
+                    self.mutate({'op': 'add', 'note': note_data})
                 
-                return jsonify({'message': 'Success', 'note': note_data}), 201
+                return self.json_response({'message': 'Success', 'note': note_data}, 201)
                 
+            except orjson.JSONEncodeError as e:
+                return self.json_response({'error': f'Note cannot be stored: {e}'}, 400)
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self.json_response({'error': str(e)}, 500)
         
         @self.app.route('/api/notes/<int:note_id>', methods=['DELETE'])
         def delete_note(note_id):
             """Soft delete a note (move to trash)"""
             try:
-                current = self.notes_list.head
-                while current:
-                    if current.data['id'] == note_id:
-                        current.data['deleted'] = True
-                        self.save_data()
-                        return jsonify({'message': 'Moved to trash'}), 200
-                    current = current.next
-                return jsonify({'error': 'Not found'}), 404
+                if self.mutate({'op': 'trash', 'id': note_id}):
+                    return self.json_response({'message': 'Moved to trash'}, 200)
+                return self.json_response({'error': 'Not found'}, 404)
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self.json_response({'error': str(e)}, 500)
         
         @self.app.route('/api/photos', methods=['GET'])
         def get_photos():
@@ -215,29 +563,23 @@ class JournalAppBackend:
             date_filter = request.args.get('date_filter', 'all')
             mood_filter = request.args.get('mood_filter', 'all')
             
-            all_photos = self.notes_list.get_notes_with_photos()
+            with self.lock:
+                keys, all_photos = self.notes_list.get_photo_columns()
             filtered = []
             
             today = datetime.now().date()
+            today_key = date_key(today.isoformat())
+            week_ago_key = date_key((today - timedelta(days=7)).isoformat())
+            month_key = today_key // 100
             
-            for photo in all_photos:
-                # Skip deleted photos
-                if photo.get('deleted'):
-                    continue
-                    
-                photo_date = photo['date'].split('T')[0]
-                
+            for key, photo in zip(keys, all_photos):
                 # Date filter
-                if date_filter == 'today' and photo_date != today.isoformat():
+                if date_filter == 'today' and key != today_key:
+                    continue
+                elif date_filter == 'week' and key < week_ago_key:
+                    continue
+                elif date_filter == 'month' and key // 100 != month_key:
                     continue
-                elif date_filter == 'week':
-                    week_ago = today - timedelta(days=7)
-                    if photo_date < week_ago.isoformat():
-                        continue
-                elif date_filter == 'month':
-                    photo_dt = datetime.fromisoformat(photo_date)
-                    if photo_dt.month != today.month or photo_dt.year != today.year:
-                        continue
                 
                 # Mood filter
                 if mood_filter != 'all' and photo['mood'] != mood_filter:
@@ -245,79 +587,74 @@ class JournalAppBackend:
                 
                 filtered.append(photo)
             
-            return jsonify(filtered)
+            return self.stream_json(filtered)
         
         @self.app.route('/api/calendar/<int:year>/<int:month>', methods=['GET'])
         def get_calendar_data(year, month):
             """Get calendar data for a month"""
+            if not (1 <= year <= 9999 and 1 <= month <= 12):
+                return self.json_response({'error': 'Invalid year or month'}, 400)
             try:
-                start_date = datetime(year, month, 1).date()
-                if month == 12:
-                    end_date = datetime(year + 1, 1, 1).date() - timedelta(days=1)
-                else:
-                    end_date = datetime(year, month + 1, 1).date() - timedelta(days=1)
-                
+                # Every day of the month falls between YYYYMM01 and YYYYMM31
+                month_key = (year * 100 + month) * 100
                 calendar_data = {}
-                current = self.notes_list.head
                 
-                while current:
-                    # Skip deleted notes
-                    if current.data.get('deleted'):
-                        current = current.next
-                        continue
-                        
-                    note_date = current.data['date'].split('T')[0]
-                    note_dt = datetime.fromisoformat(note_date).date()
-                    
-                    if start_date <= note_dt <= end_date:
-                        if note_date not in calendar_data:
-                            calendar_data[note_date] = {'notes': []}
-                        calendar_data[note_date]['notes'].append(current.data)
-                    
-                    current = current.next
+                with self.lock:
+                    for key in self.notes_list.get_keys_between(month_key + 1, month_key + 31):
+                        note_date = f"{year:04d}-{month:02d}-{key % 100:02d}"
+                        calendar_data[note_date] = {'notes': self.notes_list.get_notes_by_key(key)}
                 
-                return jsonify(calendar_data)
+                return self.json_response(calendar_data)
                 
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self.json_response({'error': str(e)}, 500)
         
         @self.app.route('/api/trash', methods=['GET'])
         def get_trash():
             """Get all deleted notes"""
             try:
-                deleted_notes = self.notes_list.get_deleted_notes()
-                return jsonify(deleted_notes)
+                with self.lock:
+                    deleted_notes = self.notes_list.get_deleted_notes()
+                return self.json_response(deleted_notes)
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self.json_response({'error': str(e)}, 500)
         
         @self.app.route('/api/trash/<int:note_id>/restore', methods=['POST'])
         def restore_note(note_id):
             """Restore a note from trash"""
             try:
-                if self.notes_list.restore_note(note_id):
-                    self.save_data()
-                    return jsonify({'message': 'Note restored'}), 200
-                return jsonify({'error': 'Not found in trash'}), 404
+                if self.mutate({'op': 'restore', 'id': note_id}):
+                    return self.json_response({'message': 'Note restored'}, 200)
+                return self.json_response({'error': 'Not found in trash'}, 404)
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self.json_response({'error': str(e)}, 500)
         
         @self.app.route('/api/trash/<int:note_id>', methods=['DELETE'])
         def permanently_delete(note_id):
             """Permanently delete a note from trash"""
             try:
-                if self.notes_list.delete_note(note_id):
-                    self.save_data()
-                    return jsonify({'message': 'Permanently deleted'}), 200
-                return jsonify({'error': 'Not found'}), 404
+                if self.mutate({'op': 'del', 'id': note_id}):
+                    return self.json_response({'message': 'Permanently deleted'}, 200)
+                return self.json_response({'error': 'Not found'}, 404)
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self.json_response({'error': str(e)}, 500)
     
-    def run(self, host='127.0.0.1', port=5000, debug=True):
-        """Run the Flask app"""
+    def run(self, host='127.0.0.1', port=5000, debug=None):
+        """Run the Flask development server (debug only with JOURNAL_DEBUG=1)"""
+        if debug is None:
+            debug = os.environ.get('JOURNAL_DEBUG') == '1'
         print(f"\n🚀 Journal App running at http://{host}:{port}")
         print(f"📊 {self.notes_list.size} notes loaded\n")
         self.app.run(host=host, port=port, debug=debug)
 
+# PRODUCTION ENTRY POINT
+# gunicorn -w 1 --threads 8 "app:create_app()"
+# waitress-serve --threads=8 --call app:create_app   (Windows)
+# Keep a single worker: notes live in memory and one process owns the journal log.
+def create_app():
+    """Build the Flask app for a WSGI server"""
+    return JournalAppBackend().app
+
 if __name__ == '__main__':
     backend = JournalAppBackend()
     backend.run()
\ No newline at end of file